@@ -1,96 +1,304 @@
-import chardet
+import argparse
+import codecs
 import ffmpeg
+import functools
+import io
+import json
 import os
 import re
+import subprocess
+import threading
 import time
 import sys
-from colorama import Fore, Style, init
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from colorama import AnsiToWin32, Fore, Style, init
+
+from chardet import UniversalDetector
+
+try:
+    # cchardet is a much faster C implementation of chardet's detection, used when installed
+    import cchardet
+except ImportError:
+    cchardet = None
 
 # Initialize colorama
 init(autoreset=True)
 
+def _console_stream():
+    """Return the stream log writes to and whether ANSI colors should be included.
+
+    colorama's wrapper flushes (and, with autoreset, resets colors) on every write, so it is bypassed
+    unless it has to translate ANSI codes into Windows console calls.
+    """
+    if sys.__stdout__ is None:
+        return sys.stdout, True
+    # A fresh AnsiToWin32 makes the same convert/strip decision that init() made for sys.stdout
+    convertor = AnsiToWin32(sys.__stdout__)
+    if convertor.convert:
+        return sys.stdout, True
+    return sys.__stdout__, not convertor.strip
+
+_OUT, _USE_COLOR = _console_stream()
+
+# Carriage-return progress lines are flushed at most this often, in seconds
+_PROGRESS_FLUSH_INTERVAL = 0.1
+_last_progress_flush = 0.0
+
 # Global flags for verbosity and silent mode
 VERBOSE = False
 SILENT = False
 
+# Matches SRT cue index lines (a number alone on its line)
+_SUB_RE = re.compile(rb'(?m)^[ \t]*\d+[ \t]*\r?$')
+_SUB_TEXT_RE = re.compile(r'(?m)^[ \t]*\d+[ \t]*\r?$')
+
+# Encoding detection reads in small chunks and never looks past the first 64 KiB
+_DETECT_CHUNK_SIZE = 8192
+_DETECT_MAX_BYTES = 65536
+_NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+
+# Per-thread chardet detector, reused for every SRT file in a batch
+_detection_state = threading.local()
+
+# Chunk size for streaming SRT files through the UTF-8 conversion
+_CONVERT_CHUNK_SIZE = 65536
+
+# Encodings that libass can already read as UTF-8 without a conversion pass
+_UTF8_COMPATIBLE_ENCODINGS = {'utf-8', 'utf-8-sig', 'ascii', ''}
+
+# Matches FFmpeg errors raised when it cannot convert subtitles from the given charenc
+_CHARENC_ERROR_RE = re.compile(r'iconv|Unable to recode subtitle|Character encoding subtitles conversion', re.IGNORECASE)
+
+# Matches episode tags such as S01E02 in file names
+_EPISODE_RE = re.compile(r'S\d+E\d+', re.IGNORECASE)
+
+_COLOR = {
+    "info": Fore.CYAN,
+    "warn": Fore.YELLOW,
+    "error": Fore.RED,
+    "success": Fore.GREEN
+}
+_RESET = Style.RESET_ALL
+
+# Hardware H.264 encoders in order of preference
+_HARDWARE_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_videotoolbox')
+
+# Explicit constant-quality settings per encoder, roughly matching libx264's default CRF 23
+_ENCODER_QUALITY_ARGS = {
+    'libx264': {'crf': 23},
+    'h264_nvenc': {'rc': 'vbr', 'cq': 23, 'b:v': 0},
+    'h264_qsv': {'global_quality': 23},
+    'h264_videotoolbox': {'q:v': 65},
+}
+
+# Seconds to wait on each encoder probe before giving up on a hung driver
+_ENCODER_PROBE_TIMEOUT = 15
+
+# Consumer GPUs only allow a few concurrent hardware encode sessions
+_HARDWARE_MAX_WORKERS = 2
+
+# Serializes console output and prompts when episodes are processed concurrently
+_CONSOLE_LOCK = threading.RLock()
+
+# Running FFmpeg processes mapped to their output files, so an interrupted TV run can stop them
+_RUNNING_FFMPEG = {}
+_RUNNING_LOCK = threading.Lock()
+_CANCELLED = threading.Event()
+
+class JobCancelled(Exception):
+    """Raised in a worker when its FFmpeg job was stopped because the batch was interrupted."""
+
 def log(message, level="info", end="\n"):
     """Log messages based on verbosity and silent mode."""
-    if SILENT:
+    if SILENT or (not VERBOSE and level not in ("error", "success")):
         return
 
-    color = {
-        "info": Fore.CYAN,
-        "warn": Fore.YELLOW,
-        "error": Fore.RED,
-        "success": Fore.GREEN
-    }.get(level, Fore.CYAN)
-    
-    if VERBOSE or level in ["error", "success"]:
-        print(color + message + Style.RESET_ALL, end=end)
+    global _last_progress_flush
+    with _CONSOLE_LOCK:
+        if _USE_COLOR:
+            _OUT.write(f"{_COLOR.get(level, Fore.CYAN)}{message}{_RESET}{end}")
+        else:
+            _OUT.write(f"{message}{end}")
+        if end == "\r":
+            # Progress updates overwrite each other, so only some of them need to reach the console
+            now = time.monotonic()
+            if now - _last_progress_flush >= _PROGRESS_FLUSH_INTERVAL:
+                _OUT.flush()
+                _last_progress_flush = now
+        elif end:
+            _OUT.flush()
         
+def prompt(message):
+    """Ask the user for input while holding the console so other jobs cannot write over the prompt."""
+    with _CONSOLE_LOCK:
+        return input(message)
+
 def ensure_folder_exists(folder_path):
     """Ensure that the output folder exists, creating it if necessary."""
-    if not os.path.exists(folder_path):
+    # Attempt the creation directly so concurrent jobs cannot race between a check and makedirs
+    try:
         os.makedirs(folder_path)
         log(f"Created output folder: {folder_path}", level="success")
-    else:
+    except FileExistsError:
         log(f"Output folder already exists: {folder_path}", level="info")
 
+def _thread_detector():
+    """Return this thread's reusable chardet detector, creating it on first use."""
+    if not hasattr(_detection_state, 'detector'):
+        _detection_state.detector = UniversalDetector()
+    return _detection_state.detector
+
+def _detect_chunks_encoding(chunks):
+    """Feed byte chunks to chardet until it is confident or the 64 KiB sample limit is reached."""
+    if cchardet:
+        # cchardet's incremental detector is less accurate than its one-shot detect(), so collect the sample first
+        sample = bytearray()
+        for chunk in chunks:
+            sample += chunk
+            if len(sample) >= _DETECT_MAX_BYTES:
+                break
+        encoding = cchardet.detect(bytes(sample[:_DETECT_MAX_BYTES]))['encoding']
+    else:
+        detector = _thread_detector()
+        detector.reset()
+        fed = 0
+        for chunk in chunks:
+            detector.feed(chunk)
+            fed += len(chunk)
+            if detector.done or fed >= _DETECT_MAX_BYTES:
+                break
+        detector.close()
+        encoding = detector.result['encoding']
+    return encoding
+
+def _detect_data_encoding(data):
+    """Detect the encoding of in-memory SRT data from a sample, looking further in if the sample is pure ASCII."""
+    view = memoryview(data)
+    encoding = _detect_chunks_encoding(view[i:i + _DETECT_CHUNK_SIZE] for i in range(0, len(view), _DETECT_CHUNK_SIZE))
+
+    if encoding and encoding.lower() == 'ascii':
+        # The sampled prefix may be followed by non-ASCII text; if so, detect again starting at its line
+        non_ascii = _NON_ASCII_RE.search(data)
+        if non_ascii:
+            start = data.rfind(b'\n', 0, non_ascii.start()) + 1
+            encoding = _detect_chunks_encoding(view[i:i + _DETECT_CHUNK_SIZE] for i in range(start, len(view), _DETECT_CHUNK_SIZE))
+    return encoding
+
+def is_utf8_compatible(encoding):
+    """Return True if text in this encoding (or an undetected one) can be used as UTF-8 as-is."""
+    return (encoding or '').lower().replace('_', '-') in _UTF8_COMPATIBLE_ENCODINGS
+
 def detect_encoding(file_path, manual_encoding=None):
     """Detect the encoding of the SRT file using chardet or a manually specified encoding."""
     try:
         if manual_encoding:
             return manual_encoding
         with open(file_path, 'rb') as f:
-            result = chardet.detect(f.read())
-            return result['encoding']
+            return _detect_chunks_encoding(iter(lambda: f.read(_DETECT_CHUNK_SIZE), b''))
     except Exception as e:
         log(f"Error detecting encoding for {file_path}: {e}", level="error")
         raise
 
+@functools.lru_cache(maxsize=None)
+def detect_hardware_encoder():
+    """Return the first hardware H.264 encoder that FFmpeg provides and can actually open, or None."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, text=True, timeout=_ENCODER_PROBE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        log(f"Could not list FFmpeg encoders: {e}", level="warn")
+        return None
+
+    for encoder in _HARDWARE_ENCODERS:
+        if encoder not in result.stdout:
+            continue
+        # Encoders can be compiled in without the matching hardware (or quality mode), so try a tiny encode first
+        quality_args = [arg for key, value in _ENCODER_QUALITY_ARGS[encoder].items() for arg in (f'-{key}', str(value))]
+        try:
+            test = subprocess.run(['ffmpeg', '-hide_banner', '-loglevel', 'error', '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+                                   '-c:v', encoder, *quality_args, '-f', 'null', '-'], capture_output=True, timeout=_ENCODER_PROBE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            log(f"Timed out testing encoder {encoder}", level="warn")
+            continue
+        if test.returncode == 0:
+            log(f"Using hardware encoder: {encoder}")
+            return encoder
+    return None
+
+def resolve_encoder(encoder="auto"):
+    """Turn the requested encoder ('auto' or an FFmpeg encoder name) into the encoder to use."""
+    if encoder == "auto":
+        return detect_hardware_encoder() or 'libx264'
+    return encoder
+
 def get_video_metadata(video_file):
     """Retrieve video metadata such as duration, resolution, frame rate, codec, and bitrate."""
     try:
-        probe = ffmpeg.probe(video_file)
-        format_info = probe['format']
-        video_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
-        audio_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'audio'), None)
-
-        # Duration, resolution, frame rate
-        duration = float(format_info['duration'])
-        resolution = f"{video_stream['width']}x{video_stream['height']}"
-        frame_rate = eval(video_stream['r_frame_rate'])  # Convert frame rate from a string to a float
-
-        # Codec and bitrate
-        video_codec = video_stream['codec_name']
-        video_bitrate = int(video_stream.get('bit_rate', 0)) / 1000  # Convert to kbps if available
-
-        audio_codec = audio_stream['codec_name'] if audio_stream else 'Unknown'
-        audio_bitrate = int(audio_stream.get('bit_rate', 0)) / 1000 if audio_stream else 0
-        audio_channels = audio_stream['channels'] if audio_stream else 'Unknown'
-
-        return {
-            "duration": duration,
-            "resolution": resolution,
-            "frame_rate": frame_rate,
-            "video_codec": video_codec,
-            "video_bitrate": video_bitrate,
-            "audio_codec": audio_codec,
-            "audio_bitrate": audio_bitrate,
-            "audio_channels": audio_channels
-        }
+        stat = os.stat(video_file)
+        return _cached_video_metadata(video_file, stat.st_size, stat.st_mtime)
     except Exception as e:
         log(f"Error getting video metadata for {video_file}: {e}", level="error")
         raise
 
-def count_subtitles(srt_file):
-    """Count the number of subtitles in the SRT file."""
+@functools.lru_cache(maxsize=256)
+def _cached_video_metadata(video_file, size, mtime):
+    """Return metadata for a (path, size, mtime) key, reusing the ffprobe sidecar file when it is still valid."""
+    sidecar_file = video_file + ".ffprobe.json"
     try:
-        with open(srt_file, 'r', encoding='utf-8', errors='ignore') as f:
-            return sum(1 for line in f if line.strip() and line.strip().isdigit())
-    except Exception as e:
-        log(f"Error counting subtitles in {srt_file}: {e}", level="error")
-        raise
+        with open(sidecar_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("size") == size and cached.get("mtime") == mtime:
+            log(f"Using cached metadata from {sidecar_file}")
+            return cached["metadata"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    metadata = _probe_video_metadata(video_file)
+
+    try:
+        with open(sidecar_file, 'w', encoding='utf-8') as f:
+            json.dump({"size": size, "mtime": mtime, "metadata": metadata}, f)
+    except OSError as e:
+        log(f"Could not write metadata cache {sidecar_file}: {e}", level="warn")
+    return metadata
+
+def parse_rational(value):
+    """Convert an ffprobe rational string such as '30000/1001' into a float."""
+    num, _, den = value.partition('/')
+    if not den:
+        return float(num)
+    den = int(den)
+    return int(num) / den if den else 0.0
+
+def _probe_video_metadata(video_file):
+    """Run ffprobe on the video file and extract the metadata fields we display."""
+    probe = ffmpeg.probe(video_file)
+    format_info = probe['format']
+    video_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
+    audio_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'audio'), None)
+
+    # Duration, resolution, frame rate
+    duration = float(format_info['duration'])
+    resolution = f"{video_stream['width']}x{video_stream['height']}"
+    frame_rate = parse_rational(video_stream['r_frame_rate'])  # Convert frame rate from a string to a float
+
+    # Codec and bitrate
+    video_codec = video_stream['codec_name']
+    video_bitrate = int(video_stream.get('bit_rate', 0)) / 1000  # Convert to kbps if available
+
+    audio_codec = audio_stream['codec_name'] if audio_stream else 'Unknown'
+    audio_bitrate = int(audio_stream.get('bit_rate', 0)) / 1000 if audio_stream else 0
+    audio_channels = audio_stream['channels'] if audio_stream else 'Unknown'
+
+    return {
+        "duration": duration,
+        "resolution": resolution,
+        "frame_rate": frame_rate,
+        "video_codec": video_codec,
+        "video_bitrate": video_bitrate,
+        "audio_codec": audio_codec,
+        "audio_bitrate": audio_bitrate,
+        "audio_channels": audio_channels
+    }
 
 def convert_to_utf8_if_needed(input_file, manual_encoding=None):
     """Convert the SRT file to UTF-8 only if it's not already in UTF-8."""
@@ -104,15 +312,17 @@ def convert_to_utf8_if_needed(input_file, manual_encoding=None):
 
         encoding = detect_encoding(input_file, manual_encoding)
         
-        if encoding.lower() == 'utf-8':
+        if is_utf8_compatible(encoding):
             log(f"No conversion needed. SRT is already in UTF-8 encoding.")
             return input_file  # Return the same file if it's already UTF-8
 
-        with open(input_file, 'r', encoding=encoding, errors='ignore') as f:
-            text = f.read()
-
-        with open(utf8_srt_file, 'w', encoding='UTF-8') as f:
-            f.write(text)
+        # Stream through incremental codecs so memory use does not grow with the file size
+        decoder = codecs.getincrementaldecoder(encoding)(errors='ignore')
+        encoder = codecs.getincrementalencoder('utf-8')()
+        with open(input_file, 'rb') as source, open(utf8_srt_file, 'wb') as target:
+            for chunk in iter(lambda: source.read(_CONVERT_CHUNK_SIZE), b''):
+                target.write(encoder.encode(decoder.decode(chunk)))
+            target.write(encoder.encode(decoder.decode(b'', final=True), final=True))
 
         log(f"File converted to UTF-8 and saved as {utf8_srt_file}", level="success")
         return utf8_srt_file
@@ -120,19 +330,68 @@ def convert_to_utf8_if_needed(input_file, manual_encoding=None):
         log(f"Error converting {input_file} to UTF-8: {e}", level="error")
         raise
 
+def prepare_srt(srt_file, manual_encoding=None):
+    """Read the SRT file once to detect its encoding and count subtitles.
+
+    Files in ASCII-compatible encodings are left on disk as-is for FFmpeg to decode with charenc;
+    only UTF-16/UTF-32 files are streamed into a UTF-8 copy by convert_to_utf8_if_needed.
+    Returns a tuple of (subtitle_file, encoding, subtitle_count).
+    """
+    try:
+        with open(srt_file, 'rb') as f:
+            data = f.read()
+
+        encoding = manual_encoding or _detect_data_encoding(data)
+
+        if is_utf8_compatible(encoding):
+            # Count directly on the bytes; only a leading BOM has to be skipped
+            if data.startswith(codecs.BOM_UTF8):
+                data = data[len(codecs.BOM_UTF8):]
+            subtitle_count = sum(1 for _ in _SUB_RE.finditer(data))
+            log(f"No conversion needed. SRT is already in UTF-8 encoding.")
+            return srt_file, encoding, subtitle_count
+
+        text = data.decode(encoding, errors='ignore')
+        subtitle_count = sum(1 for _ in _SUB_TEXT_RE.finditer(text))
+
+        if not codecs.lookup(encoding).name.startswith(('utf-16', 'utf-32')):
+            log(f"SRT is in {encoding} encoding; FFmpeg will convert it while reading.")
+            return srt_file, encoding, subtitle_count
+
+        # FFmpeg's SRT reader needs ASCII-compatible input, so wide encodings still get a UTF-8 copy
+        return convert_to_utf8_if_needed(srt_file, encoding), encoding, subtitle_count
+    except Exception as e:
+        log(f"Error preparing SRT file {srt_file}: {e}", level="error")
+        raise
+
+def escape_filter_value(value):
+    """Escape a value for use as a filter option inside an FFmpeg filtergraph string."""
+    # First for the filter's option parser, then for the filtergraph parser
+    for special_chars in ("\\':", "\\'[],;"):
+        for char in special_chars:
+            value = value.replace(char, '\\' + char)
+    return value
+
+def build_subtitles_filter(subtitle_file, charenc=None):
+    """Build the FFmpeg subtitles filter for the file, letting libavcodec convert it from charenc if given."""
+    subtitles_filter = f"subtitles={escape_filter_value(subtitle_file)}"
+    if charenc:
+        subtitles_filter += f":charenc={escape_filter_value(charenc)}"
+    return subtitles_filter
+
 def format_seconds(seconds):
     """Convert seconds into HH:MM:SS format."""
     hours, remainder = divmod(int(seconds), 3600)
     minutes, seconds = divmod(remainder, 60)
     return f"{hours:02}:{minutes:02}:{seconds:02}"
 
-def parse_ffmpeg_progress(line, total_duration, start_time):
+def parse_ffmpeg_progress(line, total_duration, start_time, label=""):
     """Parse FFmpeg progress and calculate both video time remaining and estimated runtime remaining."""
-    time_match = re.search(r'time=(\d+:\d+:\d+)', line)
-    if time_match:
-        # Convert the current video processing time to seconds
-        current_time = time.strptime(time_match.group(1), '%H:%M:%S')
-        seconds_elapsed = current_time.tm_hour * 3600 + current_time.tm_min * 60 + current_time.tm_sec
+    # '-progress' emits one key=value pair per line; the processed position is reported in microseconds.
+    # Older FFmpeg builds only emit out_time_ms, which despite its name is also in microseconds
+    key, _, value = line.partition('=')
+    if key in ('out_time_us', 'out_time_ms') and value.strip().isdigit():
+        seconds_elapsed = int(value) / 1e6
         
         # Calculate video time remaining
         video_time_remaining = total_duration - seconds_elapsed
@@ -147,7 +406,7 @@ def parse_ffmpeg_progress(line, total_duration, start_time):
         formatted_video_time_remaining = format_seconds(video_time_remaining)
         formatted_runtime_remaining = format_seconds(runtime_remaining)
 
-        log(f"Video Progress: {time_match.group(1)} | Video Time Remaining: {formatted_video_time_remaining} | Estimated Runtime Remaining: {formatted_runtime_remaining}", end="\r", level="success")
+        log(f"{label}Video Progress: {format_seconds(seconds_elapsed)} | Video Time Remaining: {formatted_video_time_remaining} | Estimated Runtime Remaining: {formatted_runtime_remaining}", end="\r", level="success")
 
 def display_file_info(mp4_file, srt_file, video_metadata, subtitle_count, srt_encoding):
     """Display information about the video and subtitle files."""
@@ -167,16 +426,15 @@ def display_file_info(mp4_file, srt_file, video_metadata, subtitle_count, srt_en
         f"Encoding: {srt_encoding}\n"
         f"Number of Subtitles: {subtitle_count}", level="info")
 
-def handle_interrupt(output_file, auto_delete=False):
-    """Handle KeyboardInterrupt and ask if the user wants to delete the output file."""
-    log(f"\n\nProcess interrupted!", level="error")
+def remove_partial_output(output_file, auto_delete=False):
+    """Delete a partial output file, asking the user first unless auto_delete is set."""
     if os.path.exists(output_file):
         if auto_delete:
             os.remove(output_file)
             log(f"Deleted partial output file: {output_file}", level="success")
         else:
             try:
-                user_choice = input(f"The output file {output_file} exists. Do you want to delete it? (y/n): ")
+                user_choice = prompt(f"The output file {output_file} exists. Do you want to delete it? (y/n): ")
                 if user_choice.lower() == 'y':
                     os.remove(output_file)
                     log(f"Deleted partial output file: {output_file}", level="success")
@@ -187,11 +445,81 @@ def handle_interrupt(output_file, auto_delete=False):
                 os.remove(output_file)
                 log(f"Deleted partial output file: {output_file}", level="success")
 
-def mix_mp4_srt(mp4_file, srt_file, folder_path="", output_folder="output", output_file=None, auto_delete=False, manual_encoding=None):
-    """Mix the MP4 video with SRT subtitles using FFmpeg with options for custom output, manual encoding, and file overwrite."""
+def handle_interrupt(output_file, auto_delete=False):
+    """Handle KeyboardInterrupt and ask if the user wants to delete the output file."""
+    log(f"\n\nProcess interrupted!", level="error")
+    remove_partial_output(output_file, auto_delete)
+
+def stop_running_ffmpeg():
+    """Cancel pending FFmpeg jobs and terminate the running ones, returning their output files."""
+    with _RUNNING_LOCK:
+        _CANCELLED.set()
+        for process in _RUNNING_FFMPEG:
+            process.terminate()
+        return list(_RUNNING_FFMPEG.values())
+
+def run_ffmpeg(mp4_file, output_file, subtitle_file, charenc, duration, burn_in=True, encoder='libx264', threads=0):
+    """Run FFmpeg to burn the subtitles into the video (or mux them as a subtitle track) while reporting progress.
+
+    threads caps FFmpeg's encoder threads (0 lets it use every core).
+    Returns a tuple of (returncode, error_output).
+    """
+    # Start time for runtime estimation
+    start_time = time.time()
+
+    video = ffmpeg.input(mp4_file)
+    if burn_in:
+        # Only the video needs re-encoding to burn in subtitles; copy the audio stream as-is
+        output = video.output(output_file, vf=build_subtitles_filter(subtitle_file, charenc), vcodec=encoder, acodec='copy', threads=threads,
+                              **_ENCODER_QUALITY_ARGS.get(encoder, {}))
+    else:
+        # Soft subtitles: copy audio and video untouched and add the SRT as a mov_text track after any existing ones.
+        # Map streams explicitly so data tracks (timecode, telemetry) are not pulled in and rejected
+        subtitles = ffmpeg.input(subtitle_file, **({'sub_charenc': charenc} if charenc else {}))
+        output = ffmpeg.output(video['v'], video['a?'], video['s?'], subtitles['s'], output_file, vcodec='copy', acodec='copy', scodec='mov_text')
+
+    # Prepare FFmpeg command with progress reporting
+    ffmpeg_cmd = (
+        output
+        .global_args('-progress', 'pipe:1')  # Output progress to stdout
+        .global_args('-loglevel', 'error')   # Suppress extra logs
+    )
+
+    # Run FFmpeg in its own process group so Ctrl-C reaches only this script, which then stops FFmpeg
+    # itself; register it so an interrupted TV run can stop it
+    with _RUNNING_LOCK:
+        if _CANCELLED.is_set():
+            raise JobCancelled()
+        process = subprocess.Popen(ffmpeg_cmd.compile(), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   start_new_session=os.name != 'nt',
+                                   creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0)
+        _RUNNING_FFMPEG[process] = output_file
+
     try:
-        # Convert the SRT file to UTF-8 if it's not already
-        utf8_srt_file = convert_to_utf8_if_needed(srt_file, manual_encoding)
+        # Parse FFmpeg's progress (ASCII key=value lines) through a buffered text reader
+        label = f"{os.path.basename(mp4_file)} | "
+        progress_output = io.TextIOWrapper(process.stdout, encoding='ascii', errors='ignore')
+        for output in progress_output:
+            parse_ffmpeg_progress(output, duration, start_time, label)
+        error_output = process.stderr.read().decode('utf-8', errors='ignore')
+        process.wait()
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            process.wait()
+        with _RUNNING_LOCK:
+            _RUNNING_FFMPEG.pop(process, None)
+
+    if _CANCELLED.is_set():
+        raise JobCancelled()
+    return process.returncode, error_output
+
+def mix_mp4_srt(mp4_file, srt_file, folder_path="", output_folder="output", output_file=None, auto_delete=False, manual_encoding=None, burn_in=True, encoder="auto", threads=0):
+    """Mix the MP4 video with SRT subtitles using FFmpeg with options for custom output, manual encoding, file overwrite, soft subtitles, encoder, and thread count."""
+    try:
+        # Detect encoding and count subtitles in a single read
+        subtitle_file, srt_encoding, subtitle_count = prepare_srt(srt_file, manual_encoding)
+        subtitle_charenc = None if subtitle_file != srt_file or is_utf8_compatible(srt_encoding) else srt_encoding
         
         # Validate file extension
         filename, file_extension = os.path.splitext(mp4_file)
@@ -219,7 +547,7 @@ def mix_mp4_srt(mp4_file, srt_file, folder_path="", output_folder="output", outp
                 log(f"Deleted existing output file: {output_file}", level="success")
             else:
                 try:
-                    user_choice = input(f"The output file {output_file} exists. Do you want to delete it? (y/n): ")
+                    user_choice = prompt(f"The output file {output_file} exists. Do you want to delete it? (y/n): ")
                     if user_choice.lower() == 'y':
                         os.remove(output_file)
                         log(f"Deleted partial output file: {output_file}", level="success")
@@ -233,39 +561,37 @@ def mix_mp4_srt(mp4_file, srt_file, folder_path="", output_folder="output", outp
         # Get the video metadata
         video_metadata = get_video_metadata(mp4_file)
 
-        # Get encoding of SRT file and count subtitles
-        srt_encoding = detect_encoding(srt_file, manual_encoding)
-        subtitle_count = count_subtitles(utf8_srt_file)
-
         # Display file info before starting the progress
         display_file_info(mp4_file, srt_file, video_metadata, subtitle_count, srt_encoding)
 
-        # Start time for runtime estimation
-        start_time = time.time()
-
-        # Prepare FFmpeg command with progress reporting
-        ffmpeg_cmd = (
-            ffmpeg
-            .input(mp4_file)
-            .output(output_file, vf=f"subtitles={utf8_srt_file}")
-            .global_args('-progress', 'pipe:1')  # Output progress to stdout
-            .global_args('-loglevel', 'error')   # Suppress extra logs
-        )
-
-        # Run FFmpeg and capture progress
-        process = ffmpeg_cmd.run_async(pipe_stdout=True, pipe_stderr=True)
-
-        # Parse FFmpeg's progress
-        while True:
-            output = process.stdout.readline().decode('utf-8')
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                parse_ffmpeg_progress(output, video_metadata['duration'], start_time)
-        
+        requested_encoder = encoder
+        encoder = resolve_encoder(encoder) if burn_in else None
+        returncode, error_output = run_ffmpeg(mp4_file, output_file, subtitle_file, subtitle_charenc, video_metadata['duration'], burn_in, encoder, threads)
+
+        if returncode != 0 and subtitle_charenc and _CHARENC_ERROR_RE.search(error_output):
+            # FFmpeg could not convert the encoding itself; fall back to converting the SRT in Python
+            log(f"\nFFmpeg could not read the subtitles as {subtitle_charenc}, retrying with a UTF-8 copy", level="warn")
+            subtitle_file, subtitle_charenc = convert_to_utf8_if_needed(srt_file, srt_encoding), None
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            returncode, error_output = run_ffmpeg(mp4_file, output_file, subtitle_file, None, video_metadata['duration'], burn_in, encoder, threads)
+
+        if returncode != 0 and requested_encoder == "auto" and encoder in _HARDWARE_ENCODERS:
+            # The detection probe cannot rule out every input (e.g. 10-bit video) or session limits, so fall back to software
+            log(f"\n{encoder} failed on {mp4_file}, retrying with libx264", level="warn")
+            encoder = 'libx264'
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            returncode, error_output = run_ffmpeg(mp4_file, output_file, subtitle_file, subtitle_charenc, video_metadata['duration'], burn_in, encoder, threads)
+
+        if returncode != 0:
+            raise RuntimeError(f"FFmpeg failed: {error_output.strip()}")
+
         log(f"MP4 and SRT have been mixed and saved to {output_file}", level="success")
     except KeyboardInterrupt:
         handle_interrupt(output_file, auto_delete)
+    except JobCancelled:
+        pass  # The interrupted batch in process_tv_series cleans up the partial output
     except FileNotFoundError as fnf_error:
         log(f"File not found: {fnf_error}", level="error")
     except TypeError as te:
@@ -273,76 +599,149 @@ def mix_mp4_srt(mp4_file, srt_file, folder_path="", output_folder="output", outp
     except Exception as e:
         log(f"An unexpected error occurred: {e}", level="error")
 
-def process_tv_series(folder_path, output_folder, auto_delete=False, manual_encoding=None):
-    """Process multiple MP4 and SRT files in a folder."""
+def episode_key(name):
+    """Return a (show, SxxEyy) key for a file name containing an episode tag, or None.
+
+    The show is the text before the tag, compared case-insensitively and without separators
+    around it, so "Show - S01E02.srt" and "show.s01e02.1080p.mp4" share a key.
+    """
+    episode_match = _EPISODE_RE.search(name)
+    if not episode_match:
+        return None
+    return name[:episode_match.start()].strip(' ._-').lower(), episode_match.group(0).upper()
+
+def index_srt_files(srt_files):
+    """Map SRT lookup keys (file name, its dot-separated prefixes, and episode key) to SRT file names."""
+    srt_by_key = {}
+    for srt in srt_files:
+        # Index dot-separated prefixes so "Show.S01E01.en.srt" pairs with "Show.S01E01.mp4", but never
+        # one that cuts off the episode tag, which would pair the bare show name with a single episode
+        stem = os.path.splitext(srt)[0]
+        episode_match = _EPISODE_RE.search(stem)
+        min_length = episode_match.end() if episode_match else 1
+        while len(stem) >= min_length:
+            srt_by_key.setdefault(stem, srt)
+            stem = stem.rpartition('.')[0]
+
+        key = episode_key(srt)
+        if key:
+            srt_by_key.setdefault(key, srt)
+    return srt_by_key
+
+def _process_episode(folder_path, mp4_file, srt_file, **kwargs):
+    """Worker for process_tv_series: announce the episode once its job actually starts, then mix it."""
+    log(f"\nProcessing {mp4_file} with {srt_file}...\n", level="info")
+    mix_mp4_srt(os.path.join(folder_path, mp4_file), os.path.join(folder_path, srt_file), folder_path=folder_path, **kwargs)
+
+def process_tv_series(folder_path, output_folder, auto_delete=False, manual_encoding=None, max_workers=None, burn_in=True, encoder="auto"):
+    """Process multiple MP4 and SRT files in a folder, running several FFmpeg jobs at once."""
     try:
         # Get a list of MP4 and SRT files in the folder
-        mp4_files = [f for f in os.listdir(folder_path) if f.endswith('.mp4')]
-        srt_files = [f for f in os.listdir(folder_path) if f.endswith('.srt')]
+        mp4_files = []
+        srt_files = []
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                if name.endswith('.mp4'):
+                    mp4_files.append(entry.name)
+                elif name.endswith('.srt'):
+                    srt_files.append(entry.name)
 
         if not mp4_files or not srt_files:
             log(f"No MP4 or SRT files found in {folder_path}.", level="error")
             return
 
+        srt_by_key = index_srt_files(srt_files)
+
+        pairs = []
         for mp4_file in mp4_files:
             # Try to find a matching SRT file based on episode/filename
             base_name = os.path.splitext(mp4_file)[0]
-            matching_srt = next((srt for srt in srt_files if base_name in srt), None)
+            matching_srt = srt_by_key.get(base_name)
+            if not matching_srt:
+                key = episode_key(base_name)
+                if key:
+                    matching_srt = srt_by_key.get(key)
 
             if matching_srt:
-                log(f"\nProcessing {mp4_file} with {matching_srt}...\n", level="info")
-                mp4_path = os.path.join(folder_path, mp4_file)
-                srt_path = os.path.join(folder_path, matching_srt)
-                mix_mp4_srt(mp4_path, srt_path, folder_path=folder_path, output_folder=output_folder, auto_delete=auto_delete, manual_encoding=manual_encoding)
+                pairs.append((mp4_file, matching_srt))
             else:
                 log(f"No matching SRT file found for {mp4_file}", level="warn")
 
+        # Probe every episode up-front so the mix calls below hit the metadata cache; this skips
+        # get_video_metadata's error logging since mix_mp4_srt reports failures for the episode
+        for mp4_file, _ in pairs:
+            mp4_path = os.path.join(folder_path, mp4_file)
+            try:
+                stat = os.stat(mp4_path)
+                _cached_video_metadata(mp4_path, stat.st_size, stat.st_mtime)
+            except Exception:
+                pass
+
+        # Each job spends its time waiting on its own FFmpeg process, so threads are enough to keep
+        # several encodes running; the cores are then split between the concurrent FFmpeg processes
+        cpu_count = os.cpu_count() or 1
+        if max_workers is None:
+            max_workers = max(1, cpu_count // 4)
+
+        # Detect the encoder once here rather than letting every worker run the detection concurrently;
+        # workers still get the requested encoder so an 'auto' choice can fall back to libx264 per episode
+        if burn_in and resolve_encoder(encoder) in _HARDWARE_ENCODERS:
+            max_workers = min(max_workers, _HARDWARE_MAX_WORKERS)
+        threads = max(1, cpu_count // max_workers)
+
+        _CANCELLED.clear()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = []
+            for mp4_file, matching_srt in pairs:
+                futures.append(executor.submit(_process_episode, folder_path, mp4_file, matching_srt, output_folder=output_folder, auto_delete=auto_delete, manual_encoding=manual_encoding, burn_in=burn_in, encoder=encoder, threads=threads))
+
+            for future in as_completed(futures):
+                future.result()
+        except KeyboardInterrupt:
+            # Only the main thread sees Ctrl-C: drop queued episodes, stop running FFmpeg jobs, then clean up
+            log(f"\n\nProcess interrupted!", level="error")
+            executor.shutdown(wait=False, cancel_futures=True)
+            output_files = stop_running_ffmpeg()
+            executor.shutdown(wait=True)
+            for output_file in output_files:
+                remove_partial_output(output_file, auto_delete)
+        finally:
+            executor.shutdown(wait=True)
+
     except Exception as e:
         log(f"Error processing TV series: {e} {os.getcwd()}", level="error")
 
-# Example usage with sys.argv
+# Example usage with command-line arguments
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print(f"{Fore.RED}Usage: python mix_mp4_srt.py <mp4_file> <srt_file> [--output <output_file>] [--encoding <encoding>] [--overwrite] [--verbose] [--silent] [--tv <folder_path>]")
-        sys.exit(1)
-
-    mp4_file = sys.argv[1]
-    srt_file = sys.argv[2]
-
-    # Parsing optional arguments
-    output_folder = "output"
-    output_file = None
-    auto_delete = False
-    manual_encoding = None
-    folder_path = None
-    
-    if "--output-folder" in sys.argv:
-        output_folder = sys.argv[sys.argv.index("--output-folder") + 1]
-
-    if "--output" in sys.argv:
-        output_file = sys.argv[sys.argv.index("--output") + 1]
-
-    if "--overwrite" in sys.argv:
-        auto_delete = True
-
-    if "--encoding" in sys.argv:
-        manual_encoding = sys.argv[sys.argv.index("--encoding") + 1]
-
-    if "--verbose" in sys.argv:
-        VERBOSE = True
-
-    if "--silent" in sys.argv:
-        SILENT = True
+    parser = argparse.ArgumentParser(description="Mix MP4 video files with SRT subtitles using FFmpeg.", allow_abbrev=False)
+    parser.add_argument("mp4_file", nargs="?", help="MP4 video file to process")
+    parser.add_argument("srt_file", nargs="?", help="SRT subtitle file to mix into the video")
+    parser.add_argument("--output-folder", default="output", help="folder to write output files to (default: output)")
+    parser.add_argument("--output", dest="output_file", help="custom output file name")
+    parser.add_argument("--overwrite", action="store_true", help="delete existing output files without prompting")
+    parser.add_argument("--encoding", dest="manual_encoding", help="encoding of the SRT file (e.g. UTF-8, ISO-8859-1)")
+    parser.add_argument("--verbose", action="store_true", help="display detailed logs")
+    parser.add_argument("--silent", action="store_true", help="suppress all output")
+    parser.add_argument("--soft-subs", action="store_true", help="add the subtitles as a selectable track instead of burning them into the video (no re-encode)")
+    parser.add_argument("--encoder", default="auto", choices=["auto", "libx264", *_HARDWARE_ENCODERS],
+                        help="video encoder for burned-in subtitles; 'auto' uses a working hardware encoder and falls back to libx264 (default: auto)")
+    parser.add_argument("--tv", dest="folder_path", help="process a folder of MP4 and SRT files (for TV series)")
+    args = parser.parse_args()
+
+    if not args.folder_path and not (args.mp4_file and args.srt_file):
+        parser.error("mp4_file and srt_file are required unless --tv is given")
+
+    VERBOSE = args.verbose
+    SILENT = args.silent
 
     try:
         # If --tv is passed, process a folder
-        if "--tv" in sys.argv:
-            folder_path = sys.argv[sys.argv.index("--tv") + 1]
-            process_tv_series(folder_path, output_folder=output_folder, auto_delete=auto_delete, manual_encoding=manual_encoding)
+        if args.folder_path:
+            process_tv_series(args.folder_path, output_folder=args.output_folder, auto_delete=args.overwrite, manual_encoding=args.manual_encoding, burn_in=not args.soft_subs, encoder=args.encoder)
         else:
             # Process a single MP4 and SRT file
-            mp4_file = sys.argv[1]
-            srt_file = sys.argv[2]
-            mix_mp4_srt(mp4_file, srt_file, output_folder=output_folder, output_file=output_file, auto_delete=auto_delete, manual_encoding=manual_encoding)
+            mix_mp4_srt(args.mp4_file, args.srt_file, output_folder=args.output_folder, output_file=args.output_file, auto_delete=args.overwrite, manual_encoding=args.manual_encoding, burn_in=not args.soft_subs, encoder=args.encoder)
     except Exception as e:
         log(f"Failed to process files: {e}", level="error")